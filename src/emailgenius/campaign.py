@@ -1,16 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
+from typing import Iterator
 
 from .config import AppConfig
 from .enrichment import build_enrichment_dossier_sync
-from .leads import build_company_and_contacts, group_rows_by_company, read_leads_csv, select_primary_contact
+from .leads import build_company_and_contacts, group_rows_by_company, read_leads_csv_iter, select_primary_contact
 from .llm import LLMGateway
 from .sheets import APPROVAL_COLUMNS, publish_approval_rows
 from .storage import PostgresStore
 from .types import ApprovalRecord, CampaignCompanyResult, CampaignSummary, DraftEmailVariant
-from .utils import utc_now_iso, write_csv
+from .utils import CSVWriter, utc_now_iso, write_csv
+
+
+_RESULT_ROW_FIELDS = attrgetter("campaign_id", "parent_slug", "recommended_variant", "risk_flags")
+_APPROVAL_ROW_FIELDS = attrgetter("status", "notes", "approved_variant", "updated_at")
+_VARIANT_TEXT = attrgetter("subject", "body")
+_MISSING_VARIANT = ("", "")
+
+CAMPAIGN_RESULTS_FLUSH_SIZE = 50
 
 
 def run_campaign(
@@ -32,78 +43,92 @@ def run_campaign(
     if parent is None:
         raise ValueError(f"Parent profile not found for slug: {parent_slug}")
 
-    rows = read_leads_csv(leads_csv_path)
-    groups = group_rows_by_company(rows)
+    groups = group_rows_by_company(chain.from_iterable(read_leads_csv_iter(leads_csv_path)))
 
     campaign_id = store.create_campaign(parent_slug=parent_slug, leads_file=leads_csv_path, sheet_id=sheet_id)
 
+    pending_results: list[CampaignCompanyResult] = []
     export_rows: list[dict[str, object]] = []
     warnings_total = 0
 
-    for company_rows in groups.values():
-        company, contacts = build_company_and_contacts(company_rows)
-        primary_contact = select_primary_contact(contacts)
-
-        dossier, discovered_website = build_enrichment_dossier_sync(
-            company=company,
-            contact=primary_contact,
-            headless=headless,
-            max_extra_pages=2,
-        )
-        if discovered_website and not company.website:
-            company.website = discovered_website
-
-        retrieval_query = _build_retrieval_query(company=company, dossier=dossier)
-        retrieval_embeddings = llm.embed_texts([retrieval_query])
-        snippets: list[str] = []
-        if retrieval_embeddings:
-            search_results = store.search_knowledge_chunks(
+    # Persist in bounded batches and flush the remainder even if a company fails midway.
+    try:
+        for company_rows in groups.values():
+            company, contacts = build_company_and_contacts(company_rows)
+            primary_contact = select_primary_contact(contacts)
+
+            dossier, discovered_website = build_enrichment_dossier_sync(
+                company=company,
+                contact=primary_contact,
+                headless=headless,
+                max_extra_pages=2,
+            )
+            if discovered_website and not company.website:
+                company.website = discovered_website
+
+            retrieval_query = _build_retrieval_query(company=company, dossier=dossier)
+            retrieval_embeddings = llm.embed_texts([retrieval_query])
+            snippets: list[str] = []
+            if retrieval_embeddings:
+                search_results = store.search_knowledge_chunks(
+                    parent_slug=parent_slug,
+                    kind="marketing",
+                    query_embedding=retrieval_embeddings[0],
+                    top_k=6,
+                )
+                snippets = [str(item.get("content") or "") for item in search_results if item.get("content")]
+
+            variants, recommended_variant, global_flags = llm.generate_campaign_variants(
+                parent=parent,
+                company=company,
+                contact=primary_contact,
+                dossier=dossier,
+                marketing_snippets=snippets,
+            )
+
+            all_flags = sorted(set(global_flags + [flag for v in variants for flag in v.risk_flags]))
+            if all_flags or not dossier.sources:
+                warnings_total += 1
+                if not dossier.sources:
+                    all_flags.append("limited_sources")
+
+            result = CampaignCompanyResult(
+                campaign_id=campaign_id,
                 parent_slug=parent_slug,
-                kind="marketing",
-                query_embedding=retrieval_embeddings[0],
-                top_k=6,
+                company=company,
+                contact=primary_contact,
+                dossier=dossier,
+                variants=variants,
+                recommended_variant=recommended_variant,
+                approval=ApprovalRecord(status="PENDING", updated_at=utc_now_iso()),
+                risk_flags=sorted(set(all_flags)),
             )
-            snippets = [str(item.get("content") or "") for item in search_results if item.get("content")]
-
-        variants, recommended_variant, global_flags = llm.generate_campaign_variants(
-            parent=parent,
-            company=company,
-            contact=primary_contact,
-            dossier=dossier,
-            marketing_snippets=snippets,
-        )
-
-        all_flags = sorted(set(global_flags + [flag for v in variants for flag in v.risk_flags]))
-        if all_flags or not dossier.sources:
-            warnings_total += 1
-            if not dossier.sources:
-                all_flags.append("limited_sources")
-
-        result = CampaignCompanyResult(
-            campaign_id=campaign_id,
-            parent_slug=parent_slug,
-            company=company,
-            contact=primary_contact,
-            dossier=dossier,
-            variants=variants,
-            recommended_variant=recommended_variant,
-            approval=ApprovalRecord(status="PENDING", updated_at=utc_now_iso()),
-            risk_flags=sorted(set(all_flags)),
-        )
-        store.insert_campaign_company_result(result)
-        export_rows.append(_company_result_to_row(result))
+            pending_results.append(result)
+            export_rows.append(_company_result_to_row(result))
+            if len(pending_results) >= CAMPAIGN_RESULTS_FLUSH_SIZE:
+                # Swap the batch out first so a failed insert is not retried by the finally block.
+                batch, pending_results = pending_results, []
+                store.insert_campaign_company_results(batch)
+    finally:
+        if pending_results:
+            store.insert_campaign_company_results(pending_results)
 
     out_base = Path(out_dir)
     out_base.mkdir(parents=True, exist_ok=True)
     export_path = out_base / f"campaign-{campaign_id}.csv"
-    write_csv(export_path, export_rows, APPROVAL_COLUMNS)
-
-    if sheet_id and config.google_service_account_json:
-        publish_approval_rows(
-            sheet_id=sheet_id,
-            rows=export_rows,
-            service_account_json=config.google_service_account_json,
-        )
+    # The Sheets publish is network-bound and independent of the local export, so overlap them.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        publish_future = None
+        if sheet_id and config.google_service_account_json:
+            publish_future = executor.submit(
+                publish_approval_rows,
+                sheet_id=sheet_id,
+                rows=export_rows,
+                service_account_json=config.google_service_account_json,
+            )
+        write_csv(export_path, export_rows, APPROVAL_COLUMNS)
+        if publish_future is not None:
+            publish_future.result()
 
     summary = CampaignSummary(
         campaign_id=campaign_id,
@@ -125,21 +150,47 @@ def campaign_status(store: PostgresStore, campaign_id: str) -> dict[str, object]
     if not summary:
         return None
 
-    records = store.list_campaign_records(campaign_id)
     status_counts: dict[str, int] = {}
-    for record in records:
+    records_total = 0
+    for record in store.list_campaign_records(campaign_id):
         status = str(record.get("status") or "UNKNOWN")
         status_counts[status] = status_counts.get(status, 0) + 1
+        records_total += 1
 
     summary["record_status_counts"] = status_counts
-    summary["records_total"] = len(records)
+    summary["records_total"] = records_total
     return summary
 
 
-def export_campaign(store: PostgresStore, campaign_id: str, output_path: str) -> Path:
-    records = store.list_campaign_records(campaign_id)
-    rows: list[dict[str, object]] = []
-    for record in records:
+class CampaignCSVWriter(CSVWriter):
+    def __init__(self, path: str | Path) -> None:
+        super().__init__(Path(path), APPROVAL_COLUMNS)
+
+
+def export_campaign(
+    store: PostgresStore,
+    campaign_id: str,
+    output_path: str | None = None,
+    *,
+    writer: CampaignCSVWriter | None = None,
+) -> Path:
+    # Batch exports can pass one open writer to append several campaigns to the same file.
+    if (output_path is None) == (writer is None):
+        raise ValueError("Pass exactly one of output_path or writer")
+    if writer is None:
+        with CampaignCSVWriter(output_path) as own_writer:
+            _write_campaign_records(store, campaign_id, own_writer)
+        return own_writer.path
+    _write_campaign_records(store, campaign_id, writer)
+    return writer.path
+
+
+def _write_campaign_records(store: PostgresStore, campaign_id: str, writer: CampaignCSVWriter) -> None:
+    writer.add_rows(_campaign_record_rows(store, campaign_id))
+
+
+def _campaign_record_rows(store: PostgresStore, campaign_id: str) -> Iterator[dict[str, object]]:
+    for record in store.list_campaign_records(campaign_id):
         payload = record.get("payload_json") or {}
         variants = payload.get("variants") if isinstance(payload, dict) else []
         by_name = {str(item.get("variant")).upper(): item for item in variants if isinstance(item, dict)}
@@ -167,11 +218,7 @@ def export_campaign(store: PostgresStore, campaign_id: str, output_path: str) ->
             "approved_variant": record.get("approved_variant") or "",
             "updated_at": str(record.get("updated_at") or ""),
         }
-        rows.append(row)
-
-    target = Path(output_path)
-    write_csv(target, rows, APPROVAL_COLUMNS)
-    return target
+        yield row
 
 
 def _build_retrieval_query(*, company, dossier) -> str:
@@ -186,34 +233,36 @@ def _build_retrieval_query(*, company, dossier) -> str:
 
 
 def _company_result_to_row(result: CampaignCompanyResult) -> dict[str, object]:
+    campaign_id, parent_slug, recommended_variant, risk_flags = _RESULT_ROW_FIELDS(result)
+    status, notes, approved_variant, updated_at = _APPROVAL_ROW_FIELDS(result.approval)
+    contact = result.contact
     variants = _variants_by_name(result.variants)
-    evidence_summary = "; ".join(result.dossier.evidence[:5])
+    a_subject, a_body = variants.get("A", _MISSING_VARIANT)
+    b_subject, b_body = variants.get("B", _MISSING_VARIANT)
+    c_subject, c_body = variants.get("C", _MISSING_VARIANT)
     row = {
-        "campaign_id": result.campaign_id,
-        "parent_slug": result.parent_slug,
+        "campaign_id": campaign_id,
+        "parent_slug": parent_slug,
         "company_name": result.company.company_name,
-        "contact_name": result.contact.full_name if result.contact else "",
-        "contact_title": result.contact.title if result.contact else "",
-        "contact_email": result.contact.email if result.contact else "",
-        "variant_a_subject": variants.get("A", {}).get("subject", ""),
-        "variant_a_body": variants.get("A", {}).get("body", ""),
-        "variant_b_subject": variants.get("B", {}).get("subject", ""),
-        "variant_b_body": variants.get("B", {}).get("body", ""),
-        "variant_c_subject": variants.get("C", {}).get("subject", ""),
-        "variant_c_body": variants.get("C", {}).get("body", ""),
-        "recommended_variant": result.recommended_variant,
-        "evidence_summary": evidence_summary,
-        "risk_flags": "; ".join(result.risk_flags),
-        "status": result.approval.status,
-        "reviewer_notes": result.approval.notes or "",
-        "approved_variant": result.approval.approved_variant or "",
-        "updated_at": result.approval.updated_at or utc_now_iso(),
+        "contact_name": contact.full_name if contact else "",
+        "contact_title": contact.title if contact else "",
+        "contact_email": contact.email if contact else "",
+        "variant_a_subject": a_subject,
+        "variant_a_body": a_body,
+        "variant_b_subject": b_subject,
+        "variant_b_body": b_body,
+        "variant_c_subject": c_subject,
+        "variant_c_body": c_body,
+        "recommended_variant": recommended_variant,
+        "evidence_summary": "; ".join(result.dossier.evidence[:5]),
+        "risk_flags": "; ".join(risk_flags),
+        "status": status,
+        "reviewer_notes": notes or "",
+        "approved_variant": approved_variant or "",
+        "updated_at": updated_at or utc_now_iso(),
     }
     return row
 
 
-def _variants_by_name(variants: list[DraftEmailVariant]) -> dict[str, dict[str, object]]:
-    out: dict[str, dict[str, object]] = {}
-    for variant in variants:
-        out[variant.variant.upper()] = asdict(variant)
-    return out
+def _variants_by_name(variants: list[DraftEmailVariant]) -> dict[str, tuple[str, str]]:
+    return {variant.variant.upper(): _VARIANT_TEXT(variant) for variant in variants}
@@ -2,17 +2,16 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import asdict
 from pathlib import Path
 
 from .campaign import campaign_status, export_campaign, run_campaign
 from .config import AppConfig
 from .knowledge import ingest_knowledge_file
 from .llm import LLMGateway
-from .pipeline import analyze_company_sync, discover_and_analyze_company_sync, result_to_dict
+from .pipeline import analyze_company_sync, discover_and_analyze_company_sync
 from .profiles import load_parent_profile
 from .storage import PostgresStore
-from .utils import slugify
+from .utils import slugify, to_json
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -85,17 +84,20 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _persist_json(payload: dict, output_path: Path) -> None:
+def _persist_json(payload: object, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    output_path.write_text(to_json(payload, indent=True), encoding="utf-8")
 
 
 def _store(config: AppConfig) -> PostgresStore:
+    store: PostgresStore | None = None
     try:
         store = PostgresStore(config.database_url)
         store.migrate()
         return store
     except Exception as exc:  # pragma: no cover - env dependent
+        if store is not None:
+            store.close()
         raise RuntimeError(
             "Database unavailable. Configure EMAILGENIUS_DATABASE_URL and ensure PostgreSQL+pgvector is running."
         ) from exc
@@ -119,10 +121,8 @@ def main() -> int:
             company_name=args.company,
             headless=not args.headful,
         )
-        payload = result_to_dict(result)
-
         output_path = Path(args.out) if args.out else Path("reports") / f"{slugify(args.company)}.json"
-        _persist_json(payload, output_path)
+        _persist_json(result, output_path)
 
         print(f"Saved analysis to: {output_path}")
         print(
@@ -148,10 +148,9 @@ def main() -> int:
             print(f"Discovery failed: {exc}")
             return 1
 
-        payload = result_to_dict(result)
         city_part = f"-{slugify(args.city)}" if args.city else ""
         output_path = Path(args.out) if args.out else Path("reports") / f"{slugify(args.company)}{city_part}.json"
-        _persist_json(payload, output_path)
+        _persist_json(result, output_path)
 
         print(f"Saved analysis to: {output_path}")
         if result.discovery and result.discovery.selected_site:
@@ -181,25 +180,26 @@ def main() -> int:
         except RuntimeError as exc:
             print(str(exc))
             return 1
-        if args.parent_command == "register":
-            profile = load_parent_profile(args.profile, slug_override=args.slug)
-            store.upsert_parent_profile(profile, set_active=args.set_active)
-            print(f"Parent profile upserted: {profile.slug}")
-            if args.set_active:
-                print(f"Active parent set to: {profile.slug}")
-            return 0
-
-        if args.parent_command == "use":
-            store.set_active_parent(args.slug)
-            print(f"Active parent set to: {args.slug}")
-            return 0
-
-        if args.parent_command == "list":
-            active_slug = store.get_active_parent_slug()
-            for profile in store.list_parent_profiles():
-                marker = "*" if profile.slug == active_slug else " "
-                print(f"{marker} {profile.slug} -> {profile.company_name}")
-            return 0
+        with store:
+            if args.parent_command == "register":
+                profile = load_parent_profile(args.profile, slug_override=args.slug)
+                store.upsert_parent_profile(profile, set_active=args.set_active)
+                print(f"Parent profile upserted: {profile.slug}")
+                if args.set_active:
+                    print(f"Active parent set to: {profile.slug}")
+                return 0
+
+            if args.parent_command == "use":
+                store.set_active_parent(args.slug)
+                print(f"Active parent set to: {args.slug}")
+                return 0
+
+            if args.parent_command == "list":
+                active_slug = store.get_active_parent_slug()
+                for profile in store.list_parent_profiles():
+                    marker = "*" if profile.slug == active_slug else " "
+                    print(f"{marker} {profile.slug} -> {profile.company_name}")
+                return 0
 
     if args.command == "knowledge":
         try:
@@ -207,35 +207,36 @@ def main() -> int:
         except RuntimeError as exc:
             print(str(exc))
             return 1
-        llm = _llm(config)
-
-        if args.knowledge_command == "ingest":
-            profile = store.get_parent_profile(args.slug)
-            if profile is None:
-                print(f"Parent slug not found: {args.slug}")
-                return 1
-
-            result = ingest_knowledge_file(
-                store=store,
-                llm=llm,
-                parent_slug=args.slug,
-                file_path=args.file,
-                kind=args.kind,
-            )
-            print(
-                f"Knowledge ingested for {result.parent_slug}: {result.source_path} | "
-                f"chunks={result.chunks_total} | embeddings={result.embeddings_used}"
-            )
-            return 0
+        with store:
+            llm = _llm(config)
+
+            if args.knowledge_command == "ingest":
+                profile = store.get_parent_profile(args.slug)
+                if profile is None:
+                    print(f"Parent slug not found: {args.slug}")
+                    return 1
+
+                result = ingest_knowledge_file(
+                    store=store,
+                    llm=llm,
+                    parent_slug=args.slug,
+                    file_path=args.file,
+                    kind=args.kind,
+                )
+                print(
+                    f"Knowledge ingested for {result.parent_slug}: {result.source_path} | "
+                    f"chunks={result.chunks_total} | embeddings={result.embeddings_used}"
+                )
+                return 0
 
-        if args.knowledge_command == "list":
-            docs = store.list_knowledge_documents(args.slug)
-            if not docs:
-                print("No documents found.")
+            if args.knowledge_command == "list":
+                docs = store.list_knowledge_documents(args.slug)
+                if not docs:
+                    print("No documents found.")
+                    return 0
+                for item in docs:
+                    print(f"{item['id']} | {item['kind']} | {item['source_path']} | {item['created_at']}")
                 return 0
-            for item in docs:
-                print(f"{item['id']} | {item['kind']} | {item['source_path']} | {item['created_at']}")
-            return 0
 
     if args.command == "campaign":
         try:
@@ -243,37 +244,38 @@ def main() -> int:
         except RuntimeError as exc:
             print(str(exc))
             return 1
-        llm = _llm(config)
-
-        if args.campaign_command == "run":
-            summary, export_path, _ = run_campaign(
-                config=config,
-                store=store,
-                llm=llm,
-                parent_slug=args.slug,
-                leads_csv_path=args.leads,
-                out_dir=args.out_dir,
-                sheet_id=args.sheet_id,
-                stages=args.stages,
-                headless=not args.headful,
-            )
-            print(f"Campaign completed: {summary.campaign_id}")
-            print(f"Companies: {summary.companies_total} | generated: {summary.generated_total} | warnings: {summary.warnings_total}")
-            print(f"Local export: {export_path}")
-            return 0
-
-        if args.campaign_command == "status":
-            status = campaign_status(store, args.campaign_id)
-            if status is None:
-                print("Campaign not found")
-                return 1
-            print(json.dumps(status, ensure_ascii=False, indent=2, default=str))
-            return 0
-
-        if args.campaign_command == "export":
-            output_path = export_campaign(store, args.campaign_id, args.out)
-            print(f"Campaign exported: {output_path}")
-            return 0
+        with store:
+            llm = _llm(config)
+
+            if args.campaign_command == "run":
+                summary, export_path, _ = run_campaign(
+                    config=config,
+                    store=store,
+                    llm=llm,
+                    parent_slug=args.slug,
+                    leads_csv_path=args.leads,
+                    out_dir=args.out_dir,
+                    sheet_id=args.sheet_id,
+                    stages=args.stages,
+                    headless=not args.headful,
+                )
+                print(f"Campaign completed: {summary.campaign_id}")
+                print(f"Companies: {summary.companies_total} | generated: {summary.generated_total} | warnings: {summary.warnings_total}")
+                print(f"Local export: {export_path}")
+                return 0
+
+            if args.campaign_command == "status":
+                status = campaign_status(store, args.campaign_id)
+                if status is None:
+                    print("Campaign not found")
+                    return 1
+                print(json.dumps(status, ensure_ascii=False, indent=2, default=str))
+                return 0
+
+            if args.campaign_command == "export":
+                output_path = export_campaign(store, args.campaign_id, args.out)
+                print(f"Campaign exported: {output_path}")
+                return 0
 
     parser.error("Unknown command")
     return 2
@@ -56,18 +56,26 @@ def _parse_pct(value: str) -> float:
     return float(value.replace(",", "."))
 
 
+# A percentage counts when the text before it (same line, up to 80 chars, not overlapping
+# the previous match) mentions a reduction token.
+_REDUCTION_PCT_RE = re.compile(r"(?P<pct>\d{1,2}(?:[\.,]\d+)?)\s*%")
+_REDUCTION_CONTEXT_CHARS = 80
+_REDUCTION_TOKENS = ("consum", "energet", "efficien", "riduz", "saving")
+
+
 def _extract_reduction_candidates(text: str) -> list[tuple[float, str]]:
-    pattern = re.compile(
-        r"(?P<context>.{0,80}?)(?P<pct>\d{1,2}(?:[\.,]\d+)?)\s*%(.{0,80}?)",
-        flags=re.IGNORECASE,
-    )
     candidates: list[tuple[float, str]] = []
-    for match in pattern.finditer(text):
+    search = _REDUCTION_PCT_RE.search
+    pos = 0
+    while (match := search(text, pos)) is not None:
+        anchor = match.start()
+        start = max(pos, anchor - _REDUCTION_CONTEXT_CHARS, text.rfind("\n", pos, anchor) + 1)
+        pos = match.end()
         pct = _parse_pct(match.group("pct"))
         if pct <= 0 or pct > 60:
             continue
-        window = match.group(0)
-        if any(token in window for token in ("consum", "energet", "efficien", "riduz", "saving")):
+        window = text[start:pos]
+        if any(token in window for token in _REDUCTION_TOKENS):
             candidates.append((pct, window.strip()))
     return candidates
 
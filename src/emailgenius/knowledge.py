@@ -8,7 +8,7 @@ from pypdf import PdfReader
 
 from .llm import LLMGateway
 from .storage import PostgresStore
-from .utils import chunk_text, sha256_of_bytes
+from .utils import chunk_text, sha256_of_file
 
 
 @dataclass(slots=True)
@@ -29,8 +29,7 @@ def ingest_knowledge_file(
     kind: str = "marketing",
 ) -> KnowledgeIngestResult:
     path = Path(file_path)
-    raw_bytes = path.read_bytes()
-    source_hash = sha256_of_bytes(raw_bytes)
+    source_hash = sha256_of_file(path)
     text = _extract_text(path)
     chunks = chunk_text(text, chunk_size=1300, overlap=220)
 
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import csv
 import re
+import sys
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
 from urllib.parse import urlparse
 
 from .types import LeadCompany, LeadContact
@@ -17,21 +22,112 @@ class LeadIngestResult:
     companies_total: int
 
 
-def read_leads_csv(path: str | Path) -> list[dict[str, str]]:
-    csv_path = Path(path)
-    with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
-        reader = csv.DictReader(handle)
-        rows = []
-        for row in reader:
-            normalized = {key: (value or "").strip() for key, value in row.items() if key}
-            rows.append(normalized)
-        return rows
-
-
-def group_rows_by_company(rows: list[dict[str, str]]) -> dict[str, list[dict[str, str]]]:
+LEADS_CSV_CHUNK_ROWS = 8192
+
+LEAD_COLUMNS = (
+    "First Name",
+    "Last Name",
+    "Full Name",
+    "Title",
+    "Headline",
+    "Seniority",
+    "Email",
+    "LinkedIn Link",
+    "Lead City",
+    "Lead State",
+    "Lead Country",
+    "Company Name",
+    "Cleaned Company Name",
+    "Industry",
+    "Employee Count",
+    "MillionVerifier Status",
+    "Company Website Full",
+    "Company LinkedIn Link",
+    "Company Keywords",
+    "Company Technologies",
+    "Company Short Description",
+    "Company Founded Year",
+    "Company City",
+    "Company State",
+    "Company Country",
+)
+
+# Casefolded header -> canonical column, covering case variants and common camelCase exports.
+_HEADER_ALIASES: dict[str, str] = {
+    **{sys.intern(column.casefold()): column for column in LEAD_COLUMNS},
+    "firstname": "First Name",
+    "lastname": "Last Name",
+    "fullname": "Full Name",
+    "jobtitle": "Title",
+    "linkedinurl": "LinkedIn Link",
+    "companyname": "Company Name",
+    "website": "Company Website Full",
+    "companywebsite": "Company Website Full",
+    "companylinkedinurl": "Company LinkedIn Link",
+    "employees": "Employee Count",
+}
+
+
+def read_leads_csv(source: str | Path | TextIO) -> list[dict[str, str]]:
+    return list(chain.from_iterable(read_leads_csv_iter(source)))
+
+
+def read_leads_csv_iter(
+    source: str | Path | TextIO,
+    chunksize: int = LEADS_CSV_CHUNK_ROWS,
+) -> Iterator[list[dict[str, str]]]:
+    # Yields normalized rows in batches so large exports never sit in memory all at once.
+    # Paths are opened here; file-like objects (already in text mode) are read as given.
+    if isinstance(source, (str, Path)):
+        with Path(source).open("r", encoding="utf-8-sig", newline="") as handle:
+            yield from _iter_lead_batches(handle, chunksize)
+    else:
+        yield from _iter_lead_batches(source, chunksize)
+
+
+def _iter_lead_batches(handle: TextIO, chunksize: int) -> Iterator[list[dict[str, str]]]:
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return
+    if header and header[0].startswith("\ufeff"):
+        header[0] = header[0][1:]
+    columns = [(index, key) for index, key in enumerate(_canonical_headers(header)) if key]
+    width = len(header)
+    batch: list[dict[str, str]] = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        batch.append({key: row[index].strip() for index, key in columns})
+        if len(batch) >= chunksize:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _canonical_headers(header: list[str]) -> list[str]:
+    # An alias never shadows a column that is already present under its canonical name.
+    present = set(header)
+    keys: list[str] = []
+    for name in header:
+        canonical = _HEADER_ALIASES.get(name.strip().casefold())
+        keys.append(canonical if canonical is not None and canonical not in present else name)
+    return keys
+
+
+def group_rows_by_company(rows: Iterable[dict[str, str]]) -> dict[str, list[dict[str, str]]]:
     groups: dict[str, list[dict[str, str]]] = defaultdict(list)
+    keys_by_cleaned_name: dict[str, str] = {}
     for row in rows:
-        company_key = _company_key(row)
+        cleaned = (row.get("Cleaned Company Name") or "").strip()
+        company_key = keys_by_cleaned_name.get(cleaned) if cleaned else None
+        if company_key is None:
+            company_key = sys.intern(_company_key(row))
+            if cleaned:
+                keys_by_cleaned_name[cleaned] = company_key
         groups[company_key].append(row)
     return dict(groups)
 
@@ -43,7 +139,7 @@ def build_company_and_contacts(company_rows: list[dict[str, str]]) -> tuple[Lead
         company_name=_first_non_empty(first, ["Company Name", "Cleaned Company Name"]) or "Azienda",
         website=_clean_url(first.get("Company Website Full")),
         linkedin_company=_clean_url(first.get("Company LinkedIn Link")),
-        industry=_empty_to_none(first.get("Industry")),
+        industry=_interned_or_none(first.get("Industry")),
         employee_count=_parse_int(first.get("Employee Count")),
         location=_build_location(first),
         keywords=_empty_to_none(first.get("Company Keywords")),
@@ -61,10 +157,10 @@ def build_contact(row: dict[str, str]) -> LeadContact:
         f"{row.get('First Name', '').strip()} {row.get('Last Name', '').strip()}".strip()
     )
     title = _empty_to_none(row.get("Title"))
-    seniority = _empty_to_none(row.get("Seniority"))
+    seniority = _interned_or_none(row.get("Seniority"))
     email = _empty_to_none(row.get("Email"))
     linkedin = _clean_url(row.get("LinkedIn Link"))
-    quality_flag = _empty_to_none(row.get("MillionVerifier Status"))
+    quality_flag = _interned_or_none(row.get("MillionVerifier Status"))
 
     score = _contact_score(
         seniority=seniority,
@@ -88,13 +184,15 @@ def build_contact(row: dict[str, str]) -> LeadContact:
 def select_primary_contact(contacts: list[LeadContact]) -> LeadContact | None:
     if not contacts:
         return None
-    sorted_contacts = sorted(contacts, key=lambda item: item.score, reverse=True)
-    primary = sorted_contacts[0]
-    for contact in sorted_contacts:
+    primary = max(contacts, key=_contact_score_key)
+    for contact in contacts:
         contact.is_primary_contact = contact is primary
     return primary
 
 
+_contact_score_key = attrgetter("score")
+
+
 def _company_key(row: dict[str, str]) -> str:
     cleaned = (row.get("Cleaned Company Name") or "").strip()
     if cleaned:
@@ -110,6 +208,7 @@ def _company_key(row: dict[str, str]) -> str:
     return slugify(fallback)
 
 
+@lru_cache(maxsize=4096)
 def _clean_url(value: str | None) -> str | None:
     if not value:
         return None
@@ -158,6 +257,11 @@ def _empty_to_none(value: str | None) -> str | None:
     return value or None
 
 
+def _interned_or_none(value: str | None) -> str | None:
+    value = _empty_to_none(value)
+    return sys.intern(value) if value else None
+
+
 def _compact_company_evidence(row: dict[str, str]) -> list[str]:
     out: list[str] = []
     if row.get("Company Short Description"):
@@ -169,6 +273,30 @@ def _compact_company_evidence(row: dict[str, str]) -> list[str]:
     return out
 
 
+_SENIORITY_RANK = {
+    "c_suite": 50,
+    "founder": 45,
+    "owner": 42,
+    "executive": 38,
+    "director": 34,
+    "manager": 28,
+    "mid": 16,
+    "entry": 10,
+}
+
+_TITLE_BOOSTS = (
+    ("ceo", 20),
+    ("chief executive officer", 20),
+    ("amministratore delegato", 20),
+    ("founder", 18),
+    ("general manager", 16),
+    ("cfo", 14),
+    ("owner", 13),
+)
+
+_COMPLETENESS_KEYS = ("Email", "LinkedIn Link", "Headline", "Title", "Seniority")
+
+
 def _contact_score(
     *,
     seniority: str | None,
@@ -178,30 +306,11 @@ def _contact_score(
 ) -> float:
     score = 0.0
 
-    seniority_rank = {
-        "c_suite": 50,
-        "founder": 45,
-        "owner": 42,
-        "executive": 38,
-        "director": 34,
-        "manager": 28,
-        "mid": 16,
-        "entry": 10,
-    }
     if seniority:
-        score += seniority_rank.get(seniority.lower(), 12)
+        score += _SENIORITY_RANK.get(seniority.lower(), 12)
 
     title_l = (title or "").lower()
-    title_boosts = {
-        "ceo": 20,
-        "chief executive officer": 20,
-        "amministratore delegato": 20,
-        "founder": 18,
-        "general manager": 16,
-        "cfo": 14,
-        "owner": 13,
-    }
-    for token, boost in title_boosts.items():
+    for token, boost in _TITLE_BOOSTS:
         if token in title_l:
             score += boost
 
@@ -211,14 +320,7 @@ def _contact_score(
     elif quality == "risky":
         score -= 5
 
-    completeness_keys = [
-        "Email",
-        "LinkedIn Link",
-        "Headline",
-        "Title",
-        "Seniority",
-    ]
-    completeness = sum(1 for key in completeness_keys if (row.get(key) or "").strip())
+    completeness = sum(1 for key in _COMPLETENESS_KEYS if (row.get(key) or "").strip())
     score += completeness * 1.5
 
     return round(score, 2)
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import math
 import re
-from dataclasses import asdict
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Any
 
 from .guardrails import apply_claim_guard
 from .types import DraftEmailVariant, EnrichmentDossier, LeadCompany, LeadContact, ParentProfile
+from .utils import fast_hash, from_json, to_json
 
 try:
     from openai import OpenAI
@@ -16,6 +17,9 @@ except Exception:  # pragma: no cover - imported lazily in environments without
     OpenAI = None  # type: ignore[assignment]
 
 
+LLM_VARIANT_CACHE_SIZE = 256
+
+
 def _clamp(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, value))
 
@@ -26,6 +30,7 @@ class LLMGateway:
         self._chat_model = chat_model
         self._embedding_model = embedding_model
         self._client = OpenAI(api_key=api_key) if (api_key and OpenAI is not None) else None
+        self._variant_cache: OrderedDict[str, tuple[list[DraftEmailVariant], str, list[str]]] = OrderedDict()
 
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         if not texts:
@@ -53,13 +58,10 @@ class LLMGateway:
             return _fallback_variants(parent, company, contact, dossier)
 
         payload = {
-            "parent_profile": asdict(parent),
-            "target_company": asdict(company),
-            "target_contact": asdict(contact) if contact else None,
-            "dossier": {
-                **asdict(dossier),
-                "news_items": [asdict(item) for item in dossier.news_items],
-            },
+            "parent_profile": parent,
+            "target_company": company,
+            "target_contact": contact,
+            "dossier": dossier,
             "retrieved_marketing_knowledge": marketing_snippets,
             "constraints": {
                 "language": "italiano",
@@ -76,7 +78,14 @@ class LLMGateway:
             "Niente promesse assolute o claim non verificabili. "
             "Output SOLO JSON valido con chiavi: variants, recommended_variant, notes."
         )
-        user_prompt = json.dumps(payload, ensure_ascii=False)
+        user_prompt = to_json(payload)
+
+        # Re-runs and retries on the same lead send an identical prompt; reuse the parsed answer.
+        cache_key = fast_hash(f"{self._chat_model}\n{user_prompt}".encode("utf-8"))
+        cached = self._variant_cache.get(cache_key)
+        if cached is not None:
+            self._variant_cache.move_to_end(cache_key)
+            return _copy_variant_result(cached)
 
         try:
             response = self._client.chat.completions.create(
@@ -88,8 +97,8 @@ class LLMGateway:
                 ],
             )
             raw_content = response.choices[0].message.content or "{}"
-            parsed = json.loads(raw_content)
-            variants_raw = parsed.get("variants", [])
+            parsed = from_json(raw_content)
+            variants_raw = _coerce_variants_raw(parsed.get("variants"))
             recommended = str(parsed.get("recommended_variant") or "A").upper()
 
             variants: list[DraftEmailVariant] = []
@@ -122,10 +131,36 @@ class LLMGateway:
 
             variants = _ensure_three_variants(variants, parent, company, contact, dossier)
             recommended = _normalize_recommended(recommended, variants)
-            return variants, recommended, sorted(set(global_flags))
+            result = (variants, recommended, sorted(set(global_flags)))
         except Exception:
             return _fallback_variants(parent, company, contact, dossier)
 
+        self._variant_cache[cache_key] = result
+        if len(self._variant_cache) > LLM_VARIANT_CACHE_SIZE:
+            self._variant_cache.popitem(last=False)
+        return _copy_variant_result(result)
+
+
+def _copy_variant_result(
+    result: tuple[list[DraftEmailVariant], str, list[str]],
+) -> tuple[list[DraftEmailVariant], str, list[str]]:
+    # Callers own the returned lists and variants, so cached entries must not leak out.
+    variants, recommended, flags = result
+    return [replace(variant, risk_flags=list(variant.risk_flags)) for variant in variants], recommended, list(flags)
+
+
+def _coerce_variants_raw(raw: object, preferred_order: tuple[str, ...] = ("A", "B", "C")) -> list[dict[str, Any]]:
+    if isinstance(raw, list):
+        return [item for item in raw if isinstance(item, dict)]
+    if not isinstance(raw, dict):
+        return []
+    # Models sometimes answer {"A": {...}, "B": {...}, "C": {...}}; the canonical shape skips the generic walk.
+    if len(raw) == len(preferred_order) and all(isinstance(raw.get(name), dict) for name in preferred_order):
+        return [{**raw[name], "variant": name} for name in preferred_order]
+    names = [name for name in preferred_order if name in raw]
+    names.extend(name for name in raw if name not in preferred_order)
+    return [{**raw[name], "variant": str(name)} for name in names if isinstance(raw[name], dict)]
+
 
 def _normalize_recommended(value: str, variants: list[DraftEmailVariant]) -> str:
     names = {variant.variant for variant in variants}
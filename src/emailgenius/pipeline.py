@@ -1,8 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import asdict
-from datetime import datetime, timezone
 
 from .browser import fetch_website_snapshot
 from .extraction import infer_company_signals
@@ -10,6 +8,7 @@ from .outreach import generate_outreach_email
 from .search import discover_company_and_news
 from .scoring import evaluate_transition50_eligibility
 from .types import AnalysisResult, DiscoveryContext
+from .utils import utc_now_iso
 
 
 async def analyze_company(
@@ -29,7 +28,7 @@ async def analyze_company(
     )
 
     return AnalysisResult(
-        created_at_utc=datetime.now(timezone.utc).isoformat(),
+        created_at_utc=utc_now_iso(),
         input_url=url,
         company_name=company_name,
         browser_snapshot=snapshot,
@@ -96,7 +95,3 @@ def discover_and_analyze_company_sync(
             news_max_results=news_max_results,
         )
     )
-
-
-def result_to_dict(result: AnalysisResult) -> dict:
-    return asdict(result)
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TextIO
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 from .types import ParentProfile
 from .utils import ensure_list, slugify
 
@@ -21,9 +27,12 @@ REQUIRED_KEYS = {
 }
 
 
-def load_parent_profile(profile_path: str | Path, *, slug_override: str | None = None) -> ParentProfile:
-    path = Path(profile_path)
-    payload = yaml.safe_load(path.read_text(encoding="utf-8"))
+def load_parent_profile(profile_path: str | Path | TextIO, *, slug_override: str | None = None) -> ParentProfile:
+    if isinstance(profile_path, (str, Path)):
+        text = Path(profile_path).read_text(encoding="utf-8")
+    else:
+        text = profile_path.read()
+    payload = yaml.load(text, Loader=_YamlLoader)
     if not isinstance(payload, dict):
         raise ValueError("Parent profile must be a YAML object.")
 
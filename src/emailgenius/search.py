@@ -3,12 +3,18 @@ from __future__ import annotations
 import base64
 import html as html_lib
 import re
+from functools import lru_cache
 from html.parser import HTMLParser
 from urllib.parse import parse_qs, unquote, urlencode, urlparse
 from urllib.request import Request, urlopen
 
 from .types import SearchHit
 
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except Exception:  # pragma: no cover - optional speedup, stdlib HTMLParser fallback
+    _FastHTMLParser = None  # type: ignore[assignment]
+
 DUCKDUCKGO_HTML_URL = "https://duckduckgo.com/html/"
 BING_SEARCH_URL = "https://www.bing.com/search"
 BING_NEWS_SEARCH_URL = "https://www.bing.com/news/search"
@@ -28,6 +34,19 @@ BLOCKED_OFFICIAL_SITE_DOMAINS = {
     "glassdoor.com",
 }
 
+_TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
+_TAG_RE = re.compile(r"<[^>]+>")
+# The title may not run past its own </a>: a lazy ".*?" there let every unclosed <h2> rescan
+# the rest of the page, which is quadratic on malformed SERP HTML.
+_BING_RESULT_RE = re.compile(
+    r"<h2[^>]*>\s*<a[^>]*href=\"(?P<href>[^\"]+)\"[^>]*>(?P<title>(?:(?!</a>).)*)</a>\s*</h2>",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+_BING_NEWS_RESULT_RE = re.compile(
+    r"<a[^>]*class=\"title\"[^>]*href=\"(?P<href>[^\"]+)\"[^>]*>(?P<title>.*?)</a>",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
 
 class _DuckDuckGoResultParser(HTMLParser):
     def __init__(self) -> None:
@@ -75,7 +94,7 @@ class _DuckDuckGoResultParser(HTMLParser):
 
 
 def _tokenize(text: str) -> list[str]:
-    return re.findall(r"[a-z0-9]{3,}", text.lower())
+    return _TOKEN_RE.findall(text.lower())
 
 
 def _domain(url: str) -> str:
@@ -108,14 +127,33 @@ def _resolve_ddg_url(raw_href: str) -> str:
     return href if parsed.scheme in {"http", "https"} else ""
 
 
+def _parse_duckduckgo_anchors_fast(html: str) -> list[SearchHit]:
+    # Same anchor filter as _DuckDuckGoResultParser.
+    hits: list[SearchHit] = []
+    for node in _FastHTMLParser(html).css("a"):
+        attrs = node.attributes
+        href = attrs.get("href") or ""
+        if "result__a" not in (attrs.get("class") or "") or not href:
+            continue
+        title = " ".join(node.text(deep=True).split())
+        url = _resolve_ddg_url(href)
+        if title and url:
+            hits.append(SearchHit(title=title, url=url))
+    return hits
+
+
 def parse_duckduckgo_html(html: str, *, max_results: int = 8) -> list[SearchHit]:
-    parser = _DuckDuckGoResultParser()
-    parser.feed(html)
+    if _FastHTMLParser is not None:
+        raw_hits = _parse_duckduckgo_anchors_fast(html)
+    else:
+        parser = _DuckDuckGoResultParser()
+        parser.feed(html)
+        raw_hits = parser.hits
 
     seen: set[str] = set()
     hits: list[SearchHit] = []
 
-    for hit in parser.hits:
+    for hit in raw_hits:
         url = hit.url.strip()
         if not url or url in seen:
             continue
@@ -128,9 +166,10 @@ def parse_duckduckgo_html(html: str, *, max_results: int = 8) -> list[SearchHit]
 
 
 def _strip_tags(value: str) -> str:
-    return re.sub(r"<[^>]+>", "", value)
+    return _TAG_RE.sub("", value)
 
 
+@lru_cache(maxsize=4096)
 def _decode_bing_redirect(raw_href: str) -> str:
     href = html_lib.unescape(raw_href.strip())
     if href.startswith("//"):
@@ -158,14 +197,10 @@ def _decode_bing_redirect(raw_href: str) -> str:
 
 
 def parse_bing_html(html: str, *, max_results: int = 8) -> list[SearchHit]:
-    pattern = re.compile(
-        r"<h2[^>]*>\s*<a[^>]*href=\"(?P<href>[^\"]+)\"[^>]*>(?P<title>.*?)</a>\s*</h2>",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
     hits: list[SearchHit] = []
     seen: set[str] = set()
 
-    for match in pattern.finditer(html):
+    for match in _BING_RESULT_RE.finditer(html):
         url = _decode_bing_redirect(match.group("href"))
         title_html = match.group("title")
         title = " ".join(_strip_tags(html_lib.unescape(title_html)).split())
@@ -181,14 +216,10 @@ def parse_bing_html(html: str, *, max_results: int = 8) -> list[SearchHit]:
 
 
 def parse_bing_news_html(html: str, *, max_results: int = 8) -> list[SearchHit]:
-    pattern = re.compile(
-        r"<a[^>]*class=\"title\"[^>]*href=\"(?P<href>[^\"]+)\"[^>]*>(?P<title>.*?)</a>",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
     hits: list[SearchHit] = []
     seen: set[str] = set()
 
-    for match in pattern.finditer(html):
+    for match in _BING_NEWS_RESULT_RE.finditer(html):
         url = html_lib.unescape(match.group("href")).strip()
         title_html = match.group("title")
         title = " ".join(_strip_tags(html_lib.unescape(title_html)).split())
@@ -298,13 +329,15 @@ def select_official_site(company_name: str, city: str | None, candidates: list[S
 
     company_tokens = _tokenize(company_name)
     city_tokens = _tokenize(city or "")
+    blocked_domains = BLOCKED_OFFICIAL_SITE_DOMAINS
+    blocked_suffixes = tuple(f".{blocked}" for blocked in blocked_domains)
 
     def score(hit: SearchHit) -> int:
         rank = 0
         host = _domain(hit.url)
         text = f"{hit.title} {hit.snippet}".lower()
 
-        if any(host == blocked or host.endswith(f".{blocked}") for blocked in BLOCKED_OFFICIAL_SITE_DOMAINS):
+        if host in blocked_domains or host.endswith(blocked_suffixes):
             rank -= 40
 
         for token in company_tokens:
@@ -329,8 +362,7 @@ def select_official_site(company_name: str, city: str | None, candidates: list[S
 
         return rank
 
-    ranked = sorted(candidates, key=score, reverse=True)
-    selected = ranked[0]
+    selected = max(candidates, key=score)
     return SearchHit(
         title=selected.title,
         url=normalize_homepage_url(selected.url),
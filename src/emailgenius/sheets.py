@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 
 import gspread
+from gspread.utils import absolute_range_name
 
 
 APPROVAL_COLUMNS = [
@@ -27,6 +29,9 @@ APPROVAL_COLUMNS = [
     "updated_at",
 ]
 
+# Google caps a single values request at ~10MB; stay below it with headroom.
+MAX_REQUEST_BYTES = 8 * 1024 * 1024
+
 
 @dataclass(slots=True)
 class SheetPublishResult:
@@ -50,17 +55,22 @@ def publish_approval_rows(
     except gspread.WorksheetNotFound:
         worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=2000, cols=len(APPROVAL_COLUMNS) + 5)
 
-    header = worksheet.row_values(1)
+    header, used_rows = _read_header_and_used_rows(spreadsheet, worksheet_name)
     if header != APPROVAL_COLUMNS:
-        worksheet.clear()
-        worksheet.append_row(APPROVAL_COLUMNS)
-
-    values: list[list[str]] = []
-    for row in rows:
-        values.append([_sheet_value(row.get(column)) for column in APPROVAL_COLUMNS])
+        # Only a wider legacy header can leave stale cells behind row 1; otherwise overwrite in place.
+        if len(header) > len(APPROVAL_COLUMNS):
+            worksheet.clear()
+            used_rows = 0
+        spreadsheet.values_update(
+            absolute_range_name(worksheet_name, "1:1"),
+            params={"valueInputOption": "RAW"},
+            body={"values": [APPROVAL_COLUMNS]},
+        )
+        used_rows = max(used_rows, 1)
 
+    values = rows_to_matrix(rows, APPROVAL_COLUMNS)
     if values:
-        worksheet.append_rows(values, value_input_option="RAW")
+        _write_values(spreadsheet, worksheet, start_row=used_rows + 1, values=values)
 
     return SheetPublishResult(
         sheet_id=sheet_id,
@@ -69,9 +79,70 @@ def publish_approval_rows(
     )
 
 
+def _read_header_and_used_rows(spreadsheet: gspread.Spreadsheet, worksheet_name: str) -> tuple[list[str], int]:
+    # Header and first column come back in one request; the first column tells where to append.
+    response = spreadsheet.values_batch_get(
+        [absolute_range_name(worksheet_name, "1:1"), absolute_range_name(worksheet_name, "A:A")]
+    )
+    header_range, first_column = (response.get("valueRanges") or [{}, {}])[:2]
+    header_values = header_range.get("values") or [[]]
+    return header_values[0], len(first_column.get("values") or [])
+
+
+def _write_values(
+    spreadsheet: gspread.Spreadsheet,
+    worksheet: gspread.Worksheet,
+    *,
+    start_row: int,
+    values: list[list[str]],
+) -> None:
+    last_row = start_row + len(values) - 1
+    if last_row > worksheet.row_count:
+        worksheet.add_rows(last_row - worksheet.row_count)
+
+    # Sub-batches go out one at a time: the gspread client and its HTTP session are not thread-safe.
+    row = start_row
+    for batch in _split_by_payload_size(values):
+        spreadsheet.values_batch_update(
+            {
+                "valueInputOption": "RAW",
+                "data": [{"range": absolute_range_name(worksheet.title, f"A{row}"), "values": batch}],
+            }
+        )
+        row += len(batch)
+
+
+def _split_by_payload_size(values: list[list[str]]) -> list[list[list[str]]]:
+    batches: list[list[list[str]]] = []
+    batch: list[list[str]] = []
+    batch_bytes = 0
+    for row in values:
+        row_bytes = _json_row_bytes(row)
+        if batch and batch_bytes + row_bytes > MAX_REQUEST_BYTES:
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(row)
+        batch_bytes += row_bytes
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _json_row_bytes(row: list[str]) -> int:
+    # Encoded size as the request body carries it: JSON escapes and \uXXXX for non-ASCII, plus separators.
+    return sum(len(json.dumps(cell)) + 2 for cell in row) + 2
+
+
+def rows_to_matrix(rows: list[dict[str, object]], columns: list[str]) -> list[list[str]]:
+    getters = [row.get for row in rows]
+    return [[_sheet_value(get(column)) for column in columns] for get in getters]
+
+
 def _sheet_value(value: object) -> str:
+    if type(value) is str:
+        return value
     if value is None:
         return ""
     if isinstance(value, (list, tuple, set)):
-        return "; ".join(str(item) for item in value)
+        return "; ".join(map(str, value))
     return str(value)
@@ -1,25 +1,58 @@
 from __future__ import annotations
 
-import json
 import uuid
-from dataclasses import asdict
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+import numpy as np
+import orjson
 import psycopg
+from pgvector.psycopg import register_vector
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb, set_json_dumps, set_json_loads
+from psycopg_pool import ConnectionPool
 
 from .profiles import parent_profile_from_dict, parent_profile_to_dict
 from .types import CampaignCompanyResult, CampaignSummary, ParentProfile
-from .utils import utc_now_iso
+from .utils import json_dumps_bytes, utc_now_iso, uuid7_batch
+
+
+SCHEMA_VERSION = "2"
+KNOWLEDGE_SEARCH_EF_SEARCH = 200
 
 
 class PostgresStore:
     def __init__(self, dsn: str) -> None:
         self._dsn = dsn
+        # Opened lazily so migrate() can create the vector extension before the adapter is registered.
+        self._pool = ConnectionPool(
+            dsn,
+            min_size=1,
+            max_size=8,
+            kwargs={"autocommit": True, "row_factory": dict_row},
+            configure=_configure_connection,
+            open=False,
+        )
+        self._pool_state = "new"
+
+    def __enter__(self) -> PostgresStore:
+        return self
 
-    def _connect(self) -> psycopg.Connection[Any]:
-        return psycopg.connect(self._dsn, autocommit=True, row_factory=dict_row)
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _connect(self) -> AbstractContextManager[psycopg.Connection[Any]]:
+        if self._pool_state == "closed":
+            raise RuntimeError("PostgresStore is closed")
+        if self._pool_state == "new":
+            self._pool.open()
+            self._pool_state = "open"
+        return self._pool.connection()
+
+    def close(self) -> None:
+        self._pool_state = "closed"
+        self._pool.close()
 
     def migrate(self) -> None:
         ddl = [
@@ -72,6 +105,12 @@ class PostgresStore:
             ON knowledge_chunks(parent_slug, kind)
             """,
             """
+            CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_embedding_hnsw
+            ON knowledge_chunks USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+            WHERE embedding IS NOT NULL
+            """,
+            """
             CREATE TABLE IF NOT EXISTS campaigns (
                 id UUID PRIMARY KEY,
                 parent_slug TEXT NOT NULL REFERENCES parent_profiles(slug) ON DELETE RESTRICT,
@@ -107,19 +146,31 @@ class PostgresStore:
             ON campaign_company_records(campaign_id, status)
             """,
         ]
-        with self._connect() as conn:
+        # The vector type may not exist yet, so migrations skip the pgvector adapter.
+        with psycopg.connect(self._dsn, autocommit=True) as conn:
             with conn.cursor() as cur:
-                for stmt in ddl:
-                    cur.execute(stmt)
+                if _read_schema_version(cur) == SCHEMA_VERSION:
+                    return
+                with conn.transaction():
+                    cur.execute(";\n".join(ddl))
+                    cur.execute(
+                        """
+                        INSERT INTO app_settings(key, value)
+                        VALUES ('schema_version', %s)
+                        ON CONFLICT (key)
+                        DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+                        """,
+                        (SCHEMA_VERSION,),
+                    )
 
     def upsert_parent_profile(self, profile: ParentProfile, *, set_active: bool = False) -> None:
-        payload = json.dumps(parent_profile_to_dict(profile), ensure_ascii=False)
+        payload = Jsonb(parent_profile_to_dict(profile))
         with self._connect() as conn:
-            with conn.cursor() as cur:
+            with conn.pipeline(), conn.cursor() as cur:
                 cur.execute(
                     """
                     INSERT INTO parent_profiles(slug, profile_json)
-                    VALUES (%s, %s::jsonb)
+                    VALUES (%s, %s)
                     ON CONFLICT (slug)
                     DO UPDATE SET
                         profile_json = EXCLUDED.profile_json,
@@ -168,10 +219,7 @@ class PostgresStore:
                 row = cur.fetchone()
                 if row is None:
                     return None
-                payload = row["profile_json"]
-                if isinstance(payload, str):
-                    payload = json.loads(payload)
-                return parent_profile_from_dict(payload)
+                return parent_profile_from_dict(row["profile_json"])
 
     def list_parent_profiles(self) -> list[ParentProfile]:
         out: list[ParentProfile] = []
@@ -179,10 +227,7 @@ class PostgresStore:
             with conn.cursor() as cur:
                 cur.execute("SELECT profile_json FROM parent_profiles ORDER BY slug")
                 for row in cur.fetchall():
-                    payload = row["profile_json"]
-                    if isinstance(payload, str):
-                        payload = json.loads(payload)
-                    out.append(parent_profile_from_dict(payload))
+                    out.append(parent_profile_from_dict(row["profile_json"]))
         return out
 
     def upsert_knowledge_document(
@@ -194,31 +239,27 @@ class PostgresStore:
         source_hash: str,
         metadata: dict[str, object] | None = None,
     ) -> str:
-        metadata_json = json.dumps(metadata or {}, ensure_ascii=False)
+        metadata_json = Jsonb(metadata or {})
         with self._connect() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
-                    SELECT id FROM knowledge_documents
-                    WHERE parent_slug=%s AND kind=%s AND source_hash=%s
+                    WITH upserted AS (
+                        INSERT INTO knowledge_documents(id, parent_slug, kind, source_path, source_hash, metadata_json)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (parent_slug, kind, source_hash)
+                        DO UPDATE SET source_path = EXCLUDED.source_path
+                        RETURNING id, (xmax = 0) AS inserted
+                    ), purged AS (
+                        DELETE FROM knowledge_chunks
+                        WHERE document_id IN (SELECT id FROM upserted WHERE NOT inserted)
+                    )
+                    SELECT id FROM upserted
                     """,
-                    (parent_slug, kind, source_hash),
+                    (str(uuid.uuid4()), parent_slug, kind, source_path, source_hash, metadata_json),
                 )
                 row = cur.fetchone()
-                if row:
-                    doc_id = str(row["id"])
-                    cur.execute("DELETE FROM knowledge_chunks WHERE document_id=%s", (doc_id,))
-                    return doc_id
-
-                doc_id = str(uuid.uuid4())
-                cur.execute(
-                    """
-                    INSERT INTO knowledge_documents(id, parent_slug, kind, source_path, source_hash, metadata_json)
-                    VALUES (%s, %s, %s, %s, %s, %s::jsonb)
-                    """,
-                    (doc_id, parent_slug, kind, source_path, source_hash, metadata_json),
-                )
-                return doc_id
+                return str(row["id"])
 
     def insert_knowledge_chunks(
         self,
@@ -230,35 +271,34 @@ class PostgresStore:
         embeddings: list[list[float]] | None,
         metadata: dict[str, object] | None = None,
     ) -> int:
-        metadata_json = json.dumps(metadata or {}, ensure_ascii=False)
-        inserted = 0
+        metadata_payload = metadata or {}
+        document_uuid = uuid.UUID(document_id)
+        chunk_ids = uuid7_batch(len(chunks))
         with self._connect() as conn:
             with conn.cursor() as cur:
-                for idx, chunk in enumerate(chunks):
-                    embedding_sql = _vector_literal(embeddings[idx]) if embeddings else None
-                    cur.execute(
-                        """
-                        INSERT INTO knowledge_chunks(
-                            id, document_id, parent_slug, kind, chunk_index,
-                            content, metadata_json, embedding
-                        ) VALUES (
-                            %s, %s, %s, %s, %s,
-                            %s, %s::jsonb, %s::vector
+                with cur.copy(
+                    """
+                    COPY knowledge_chunks(
+                        id, document_id, parent_slug, kind, chunk_index,
+                        content, metadata_json, embedding
+                    ) FROM STDIN WITH (FORMAT BINARY)
+                    """
+                ) as copy:
+                    copy.set_types(["uuid", "uuid", "text", "text", "int4", "text", "jsonb", "vector"])
+                    for idx, chunk in enumerate(chunks):
+                        copy.write_row(
+                            (
+                                chunk_ids[idx],
+                                document_uuid,
+                                parent_slug,
+                                kind,
+                                idx,
+                                chunk,
+                                metadata_payload,
+                                _vector_param(embeddings[idx]) if embeddings else None,
+                            )
                         )
-                        """,
-                        (
-                            str(uuid.uuid4()),
-                            document_id,
-                            parent_slug,
-                            kind,
-                            idx,
-                            chunk,
-                            metadata_json,
-                            embedding_sql,
-                        ),
-                    )
-                    inserted += 1
-        return inserted
+        return len(chunks)
 
     def list_knowledge_documents(self, parent_slug: str) -> list[dict[str, object]]:
         with self._connect() as conn:
@@ -284,19 +324,30 @@ class PostgresStore:
     ) -> list[dict[str, object]]:
         if not query_embedding:
             return []
-        vector_query = _vector_literal(query_embedding)
-        with self._connect() as conn:
+        with self._connect() as conn, conn.transaction():
             with conn.cursor() as cur:
+                # parent_slug/kind are applied after the HNSW scan, so widen the candidate list for this
+                # transaction only; the default ef_search=40 can leave filtered queries short of top_k.
+                cur.execute(
+                    "SELECT set_config('hnsw.ef_search', %s, true)",
+                    (str(max(KNOWLEDGE_SEARCH_EF_SEARCH, top_k)),),
+                )
                 cur.execute(
                     """
                     SELECT content, metadata_json,
-                           (1 - (embedding <=> %s::vector)) AS similarity
+                           (1 - (embedding <=> %(query)s)) AS similarity
                     FROM knowledge_chunks
-                    WHERE parent_slug=%s AND kind=%s AND embedding IS NOT NULL
-                    ORDER BY embedding <=> %s::vector
-                    LIMIT %s
+                    WHERE parent_slug=%(parent_slug)s AND kind=%(kind)s AND embedding IS NOT NULL
+                    ORDER BY embedding <=> %(query)s
+                    LIMIT %(top_k)s
                     """,
-                    (vector_query, parent_slug, kind, vector_query, top_k),
+                    {
+                        "query": _vector_param(query_embedding),
+                        "parent_slug": parent_slug,
+                        "kind": kind,
+                        "top_k": top_k,
+                    },
+                    prepare=True,
                 )
                 rows = [dict(row) for row in cur.fetchall()]
         return rows
@@ -315,67 +366,68 @@ class PostgresStore:
         return campaign_id
 
     def finalize_campaign(self, campaign_id: str, summary: CampaignSummary) -> None:
-        summary_json = json.dumps(asdict(summary), ensure_ascii=False)
+        summary_json = Jsonb(summary)
         with self._connect() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
                     UPDATE campaigns
-                    SET status=%s, finished_at=NOW(), summary_json=%s::jsonb
+                    SET status=%s, finished_at=NOW(), summary_json=%s
                     WHERE id=%s
                     """,
                     (summary.status, summary_json, campaign_id),
                 )
 
     def insert_campaign_company_result(self, result: CampaignCompanyResult) -> str:
-        record_id = str(uuid.uuid4())
-        payload = json.dumps(
-            {
-                "company": asdict(result.company),
-                "contact": asdict(result.contact) if result.contact else None,
-                "dossier": {
-                    **asdict(result.dossier),
-                    "news_items": [asdict(item) for item in result.dossier.news_items],
-                },
-                "variants": [asdict(item) for item in result.variants],
-                "recommended_variant": result.recommended_variant,
-                "approval": asdict(result.approval),
-                "risk_flags": result.risk_flags,
-                "created_at": utc_now_iso(),
-            },
-            ensure_ascii=False,
-        )
+        return self.insert_campaign_company_results([result])[0]
+
+    def insert_campaign_company_results(self, results: list[CampaignCompanyResult]) -> list[str]:
+        if not results:
+            return []
+        record_ids = uuid7_batch(len(results))
+        created_at = utc_now_iso()
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
+                with cur.copy(
                     """
-                    INSERT INTO campaign_company_records(
+                    COPY campaign_company_records(
                         id, campaign_id, parent_slug, company_key, company_name,
                         contact_name, contact_title, contact_email, payload_json,
                         status, reviewer, reviewer_notes, approved_variant
-                    ) VALUES (
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s::jsonb,
-                        %s, %s, %s, %s
-                    )
-                    """,
-                    (
-                        record_id,
-                        result.campaign_id,
-                        result.parent_slug,
-                        result.company.company_key,
-                        result.company.company_name,
-                        result.contact.full_name if result.contact else None,
-                        result.contact.title if result.contact else None,
-                        result.contact.email if result.contact else None,
-                        payload,
-                        result.approval.status,
-                        result.approval.reviewer,
-                        result.approval.notes,
-                        result.approval.approved_variant,
-                    ),
-                )
-        return record_id
+                    ) FROM STDIN
+                    """
+                ) as copy:
+                    for record_id, result in zip(record_ids, results):
+                        payload = Jsonb(
+                            {
+                                "company": result.company,
+                                "contact": result.contact,
+                                "dossier": result.dossier,
+                                "variants": result.variants,
+                                "recommended_variant": result.recommended_variant,
+                                "approval": result.approval,
+                                "risk_flags": result.risk_flags,
+                                "created_at": created_at,
+                            }
+                        )
+                        copy.write_row(
+                            (
+                                record_id,
+                                result.campaign_id,
+                                result.parent_slug,
+                                result.company.company_key,
+                                result.company.company_name,
+                                result.contact.full_name if result.contact else None,
+                                result.contact.title if result.contact else None,
+                                result.contact.email if result.contact else None,
+                                payload,
+                                result.approval.status,
+                                result.approval.reviewer,
+                                result.approval.notes,
+                                result.approval.approved_variant,
+                            )
+                        )
+        return [str(record_id) for record_id in record_ids]
 
     def get_campaign_summary(self, campaign_id: str) -> dict[str, object] | None:
         with self._connect() as conn:
@@ -390,19 +442,13 @@ class PostgresStore:
                     (campaign_id,),
                 )
                 row = cur.fetchone()
-                if not row:
-                    return None
+                return dict(row) if row else None
 
-                summary_json = row.get("summary_json")
-                if isinstance(summary_json, str):
-                    summary_json = json.loads(summary_json)
-                out = dict(row)
-                out["summary_json"] = summary_json
-                return out
-
-    def list_campaign_records(self, campaign_id: str) -> list[dict[str, object]]:
-        with self._connect() as conn:
-            with conn.cursor() as cur:
+    def list_campaign_records(self, campaign_id: str) -> Iterator[dict[str, object]]:
+        # Server-side cursors only live inside a transaction; rows arrive in batches of itersize.
+        with self._connect() as conn, conn.transaction():
+            with conn.cursor(name="campaign_records_stream") as cur:
+                cur.itersize = 500
                 cur.execute(
                     """
                     SELECT id, parent_slug, company_key, company_name, contact_name,
@@ -415,15 +461,8 @@ class PostgresStore:
                     """,
                     (campaign_id,),
                 )
-                rows = []
-                for row in cur.fetchall():
-                    payload = row.get("payload_json")
-                    if isinstance(payload, str):
-                        payload = json.loads(payload)
-                    item = dict(row)
-                    item["payload_json"] = payload
-                    rows.append(item)
-                return rows
+                for row in cur:
+                    yield dict(row)
 
     def purge_expired_campaign_data(self, retention_days: int) -> int:
         with self._connect() as conn:
@@ -438,7 +477,23 @@ class PostgresStore:
                 return cur.rowcount
 
 
-def _vector_literal(values: list[float] | None) -> str | None:
+def _read_schema_version(cur: psycopg.Cursor[Any]) -> str | None:
+    try:
+        cur.execute("SELECT value FROM app_settings WHERE key='schema_version'")
+    except psycopg.errors.UndefinedTable:
+        return None
+    row = cur.fetchone()
+    return str(row[0]) if row else None
+
+
+def _configure_connection(conn: psycopg.Connection[Any]) -> None:
+    register_vector(conn)
+    # Same orjson options as utils.to_json; the UTF-8 bytes output is sent by psycopg as-is.
+    set_json_dumps(json_dumps_bytes, conn)
+    set_json_loads(orjson.loads, conn)
+
+
+def _vector_param(values: list[float] | None) -> np.ndarray | None:
     if not values:
         return None
-    return "[" + ",".join(f"{float(value):.8f}" for value in values) + "]"
+    return np.asarray(values, dtype=np.float32)
@@ -2,97 +2,240 @@ from __future__ import annotations
 
 import csv
 import hashlib
-import json
+import io
+import os
 import re
+import time
+import uuid
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 from typing import Iterable
 
+import orjson
+
+
+try:
+    from blake3 import blake3
+except Exception:  # pragma: no cover - optional speedup, sha256 fallback
+    blake3 = None  # type: ignore[assignment]
+
+
+_UTC = timezone.utc
+_SLUG_DISALLOWED_RE = re.compile(r"[^a-z0-9-]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+CSV_WRITE_BUFFER_BYTES = 1024 * 1024
+CSV_WRITE_BATCH_ROWS = 512
+FILE_HASH_BLOCK_BYTES = 128 * 1024
+
 
 def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.now(_UTC).isoformat(timespec="seconds")
 
 
 def slugify(value: str) -> str:
-    allowed = "abcdefghijklmnopqrstuvwxyz0123456789-"
     lowered = value.lower().replace(" ", "-")
-    cleaned = "".join(ch for ch in lowered if ch in allowed)
-    return cleaned or "item"
+    return _SLUG_DISALLOWED_RE.sub("", lowered) or "item"
 
 
 def ensure_list(value: object) -> list[str]:
     if value is None:
         return []
     if isinstance(value, list):
-        return [str(item).strip() for item in value if str(item).strip()]
+        return [text for item in value if (text := str(item).strip())]
     if isinstance(value, str):
-        if not value.strip():
-            return []
-        if ";" in value:
-            parts = [part.strip() for part in value.split(";")]
-            return [part for part in parts if part]
-        if "," in value:
-            parts = [part.strip() for part in value.split(",")]
-            return [part for part in parts if part]
-        return [value.strip()]
+        # ";" wins over "," so items like "Rossi, Mario; Bianchi" keep their inner commas.
+        separator = ";" if ";" in value else ","
+        return [part for item in value.split(separator) if (part := item.strip())]
     return [str(value)]
 
 
+def uuid7_batch(count: int) -> list[uuid.UUID]:
+    # UUIDv7 (RFC 9562): the millisecond timestamp prefix keeps bulk primary-key inserts together.
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bytes = os.urandom(10 * count)
+    prefix = (timestamp_ms << 80) | (0x7 << 76) | (0b10 << 62)
+    out: list[uuid.UUID] = []
+    for index in range(count):
+        rand = int.from_bytes(random_bytes[index * 10 : (index + 1) * 10], "big")
+        rand_a = (rand >> 68) & 0xFFF
+        rand_b = rand & ((1 << 62) - 1)
+        out.append(uuid.UUID(int=prefix | (rand_a << 64) | rand_b))
+    return out
+
+
 def sha256_of_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def fast_hash(data: bytes) -> str:
+    # In-process cache/dedup keys only: the digest depends on whether blake3 is installed,
+    # so anything persisted (e.g. knowledge source hashes) must keep using sha256.
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_of_file(path: str | Path) -> str:
+    with Path(path).open("rb") as handle:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: handle.read(FILE_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+def _is_collapsed(text: str) -> bool:
+    # Printable text has no whitespace besides plain spaces, so it is already normalized
+    # unless it has a double space or a leading/trailing one.
+    return text.isprintable() and "  " not in text and text[0] != " " and text[-1] != " "
+
+
 def chunk_text(text: str, *, chunk_size: int = 1200, overlap: int = 180) -> list[str]:
-    normalized = re.sub(r"\s+", " ", text or "").strip()
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if not text:
+        return []
+    if len(text) <= chunk_size and _is_collapsed(text):
+        return [text]
+    normalized = _WHITESPACE_RE.sub(" ", text).strip()
     if not normalized:
         return []
 
+    # Whitespace is already collapsed to single spaces, so chunk edges only need a boundary check.
     chunks: list[str] = []
+    length = len(normalized)
     start = 0
-    while start < len(normalized):
-        end = min(start + chunk_size, len(normalized))
-        chunk = normalized[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end >= len(normalized):
+    while start < length:
+        if normalized[start] == " ":
+            start += 1
+        end = min(start + chunk_size, length)
+        if end < length:
+            space = normalized.rfind(" ", start, end)
+            if space > start + chunk_size // 2:
+                end = space
+        chunks.append(normalized[start:end])
+        if end >= length:
             break
-        start = max(0, end - overlap)
+        start = max(end - overlap, start + 1)
     return chunks
 
 
-def write_csv(path: Path, rows: list[dict[str, object]], fieldnames: list[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({key: _safe_csv_value(row.get(key)) for key in fieldnames})
+class CSVWriter:
+    # Keeps one file open so several batches of rows can share a single export.
+    # Rows go to a temp file beside the target, which only replaces it once the writer closes cleanly.
+    def __init__(self, path: Path, fieldnames: list[str]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self._tmp_path = path.with_name(f".{path.name}.tmp")
+        self._handle = self._tmp_path.open("w", encoding="utf-8", newline="")
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(self.fieldnames)
+
+    def add(self, row: dict[str, object]) -> None:
+        self._writer.writerow(tuple(_safe_csv_value(row.get(key)) for key in self.fieldnames))
+        if self._buffer.tell() >= CSV_WRITE_BUFFER_BYTES:
+            self._flush()
+
+    def add_rows(self, rows: Iterable[dict[str, object]]) -> None:
+        fieldnames = self.fieldnames
+        rows = iter(rows)
+        while batch := list(islice(rows, CSV_WRITE_BATCH_ROWS)):
+            self._writer.writerows(tuple(_safe_csv_value(row.get(key)) for key in fieldnames) for row in batch)
+            if self._buffer.tell() >= CSV_WRITE_BUFFER_BYTES:
+                self._flush()
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._flush()
+        self._handle.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def _flush(self) -> None:
+        self._handle.write(self._buffer.getvalue())
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+
+    def __enter__(self) -> CSVWriter:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+def write_csv(path: Path, rows: Iterable[dict[str, object]], fieldnames: list[str]) -> None:
+    with CSVWriter(path, fieldnames) as writer:
+        writer.add_rows(rows)
+
+
+def _join_csv_items(value: list[object] | tuple[object, ...] | set[object]) -> str:
+    return "; ".join(map(str, value))
+
+
+def _dict_csv_value(value: dict[object, object]) -> str:
+    return json_dumps_bytes(value).decode("utf-8")
+
+
+_CSV_VALUE_CONVERTERS = {
+    str: str,
+    int: str,
+    float: str,
+    bool: str,
+    type(None): lambda value: "",
+    list: _join_csv_items,
+    tuple: _join_csv_items,
+    set: _join_csv_items,
+    dict: _dict_csv_value,
+}
 
 
 def _safe_csv_value(value: object) -> str:
-    if value is None:
-        return ""
+    convert = _CSV_VALUE_CONVERTERS.get(type(value))
+    if convert is not None:
+        return convert(value)
     if isinstance(value, (list, tuple, set)):
-        return "; ".join(str(item) for item in value)
+        return _join_csv_items(value)
     if isinstance(value, dict):
-        return json.dumps(value, ensure_ascii=False)
+        return _dict_csv_value(value)
     return str(value)
 
 
-def to_json(value: object) -> str:
-    return json.dumps(value, ensure_ascii=False)
+def json_dumps_bytes(value: object) -> bytes:
+    return orjson.dumps(value, option=_JSON_OPTIONS)
+
+
+def to_json(value: object, *, indent: bool = False) -> str:
+    option = _JSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(value, option=option).decode("utf-8")
 
 
 def from_json(value: str | None) -> object:
     if not value:
         return None
-    return json.loads(value)
+    return orjson.loads(value)
 
 
 def compact_lines(lines: Iterable[str], *, limit: int = 10) -> list[str]:
     out: list[str] = []
     for item in lines:
-        item = " ".join(str(item).split())
+        item = str(item)
+        if item and not _is_collapsed(item):
+            item = _WHITESPACE_RE.sub(" ", item).strip()
         if not item:
             continue
         out.append(item)
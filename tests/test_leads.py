@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import io
 import tempfile
 import unittest
 from pathlib import Path
@@ -9,8 +10,10 @@ from emailgenius.leads import (
     build_company_and_contacts,
     group_rows_by_company,
     read_leads_csv,
+    read_leads_csv_iter,
     select_primary_contact,
 )
+from emailgenius.types import LeadContact
 
 
 HEADERS = [
@@ -104,26 +107,75 @@ class LeadTests(unittest.TestCase):
         self.assertEqual(primary.full_name, "Mario Rossi")
         self.assertTrue(primary.is_primary_contact)
 
+    def test_primary_contact_keeps_first_of_tied_scores(self) -> None:
+        contacts = [
+            LeadContact("Anna", None, None, None, None, None, score=10.0),
+            LeadContact("Bruno", None, None, None, None, None, score=30.0),
+            LeadContact("Carla", None, None, None, None, None, score=30.0),
+        ]
+
+        primary = select_primary_contact(contacts)
+
+        self.assertEqual(primary.full_name, "Bruno")
+        self.assertEqual([contact.is_primary_contact for contact in contacts], [False, True, False])
+        self.assertIsNone(select_primary_contact([]))
+
     def test_csv_reader_with_real_header_shape(self) -> None:
+        buffer = io.StringIO(newline="")
+        writer = csv.DictWriter(buffer, fieldnames=HEADERS)
+        writer.writeheader()
+        writer.writerow({
+            "First Name": "Anna",
+            "Last Name": "Verdi",
+            "Full Name": "Anna Verdi",
+            "Title": "Founder",
+            "Seniority": "founder",
+            "Email": "anna@example.com",
+            "Company Name": "Beta SRL",
+            "Company Website Full": "https://beta.it",
+        })
+        buffer.seek(0)
+
+        rows = read_leads_csv(buffer)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["Company Name"], "Beta SRL")
+
+    def test_csv_iter_yields_bounded_batches(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "leads.csv"
             with path.open("w", encoding="utf-8", newline="") as handle:
                 writer = csv.DictWriter(handle, fieldnames=HEADERS)
                 writer.writeheader()
-                writer.writerow({
-                    "First Name": "Anna",
-                    "Last Name": "Verdi",
-                    "Full Name": "Anna Verdi",
-                    "Title": "Founder",
-                    "Seniority": "founder",
-                    "Email": "anna@example.com",
+                for index in range(5):
+                    writer.writerow({"Full Name": f" Lead {index} ", "Company Name": "Beta SRL"})
+
+            batches = list(read_leads_csv_iter(path, chunksize=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(batches[-1][0]["Full Name"], "Lead 4")
+        self.assertEqual(batches[0][0]["Email"], "")
+
+    def test_alias_headers_resolve_to_canonical_columns(self) -> None:
+        source = io.StringIO(
+            "\ufeffcompanyName,website,jobTitle,EMAIL,Title,notes\n"
+            "Beta SRL,https://beta.it,CEO,anna@beta.it,Founder,vip\n"
+        )
+
+        rows = read_leads_csv(source)
+
+        self.assertEqual(
+            rows,
+            [
+                {
                     "Company Name": "Beta SRL",
                     "Company Website Full": "https://beta.it",
-                })
-
-            rows = read_leads_csv(path)
-            self.assertEqual(len(rows), 1)
-            self.assertEqual(rows[0]["Company Name"], "Beta SRL")
+                    "jobTitle": "CEO",
+                    "Email": "anna@beta.it",
+                    "Title": "Founder",
+                    "notes": "vip",
+                }
+            ],
+        )
 
 
 if __name__ == "__main__":
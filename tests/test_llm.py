@@ -1,59 +1,61 @@
 from __future__ import annotations
 
 import unittest
+from types import SimpleNamespace
 
-from emailgenius.llm import LLMGateway
+from emailgenius.llm import LLMGateway, _coerce_variants_raw
 from emailgenius.types import EnrichmentDossier, LeadCompany, LeadContact, ParentProfile
 
 
+PARENT = ParentProfile(
+    slug="azienda-a",
+    company_name="Azienda A",
+    tone="formale-consulenziale",
+    offer_catalog=["Servizio 1"],
+    icp=["PMI manifatturiere"],
+    proof_points=["Case study"],
+    objections=["budget"],
+    cta_policy="call conoscitiva 20-30 min",
+    no_go_claims=["garantito"],
+    compliance_notes=["uso dati pubblici"],
+)
+COMPANY = LeadCompany(
+    company_key="acme",
+    company_name="Acme",
+    website="https://acme.it",
+    linkedin_company=None,
+    industry="machinery",
+    employee_count=50,
+    location="Bergamo, Lombardy, Italy",
+    keywords="automation, b2b",
+    tech="WordPress",
+    founded_year=1999,
+)
+CONTACT = LeadContact(
+    full_name="Mario Rossi",
+    title="CEO",
+    seniority="c_suite",
+    email="mario@example.com",
+    linkedin_person=None,
+    quality_flag="good",
+    score=80,
+)
+DOSSIER = EnrichmentDossier(
+    site_summary="azienda manifatturiera",
+    pain_hypotheses=["pressione su efficienza"],
+    opportunity_hypotheses=["quick win commerciali"],
+)
+
+
 class LLMFallbackTests(unittest.TestCase):
     def test_generates_three_variants_without_api_key(self) -> None:
         llm = LLMGateway(api_key=None, chat_model="gpt-5", embedding_model="text-embedding-3-small")
 
-        parent = ParentProfile(
-            slug="azienda-a",
-            company_name="Azienda A",
-            tone="formale-consulenziale",
-            offer_catalog=["Servizio 1"],
-            icp=["PMI manifatturiere"],
-            proof_points=["Case study"],
-            objections=["budget"],
-            cta_policy="call conoscitiva 20-30 min",
-            no_go_claims=["garantito"],
-            compliance_notes=["uso dati pubblici"],
-        )
-        company = LeadCompany(
-            company_key="acme",
-            company_name="Acme",
-            website="https://acme.it",
-            linkedin_company=None,
-            industry="machinery",
-            employee_count=50,
-            location="Bergamo, Lombardy, Italy",
-            keywords="automation, b2b",
-            tech="WordPress",
-            founded_year=1999,
-        )
-        contact = LeadContact(
-            full_name="Mario Rossi",
-            title="CEO",
-            seniority="c_suite",
-            email="mario@example.com",
-            linkedin_person=None,
-            quality_flag="good",
-            score=80,
-        )
-        dossier = EnrichmentDossier(
-            site_summary="azienda manifatturiera",
-            pain_hypotheses=["pressione su efficienza"],
-            opportunity_hypotheses=["quick win commerciali"],
-        )
-
         variants, recommended, flags = llm.generate_campaign_variants(
-            parent=parent,
-            company=company,
-            contact=contact,
-            dossier=dossier,
+            parent=PARENT,
+            company=COMPANY,
+            contact=CONTACT,
+            dossier=DOSSIER,
             marketing_snippets=[],
         )
 
@@ -62,5 +64,52 @@ class LLMFallbackTests(unittest.TestCase):
         self.assertIsInstance(flags, list)
 
 
+class CoerceVariantsTests(unittest.TestCase):
+    def test_coerce_variants_raw_accepts_dict_mapping(self) -> None:
+        raw = {"C": {"subject": "c"}, "A": {"subject": "a", "variant": "Z"}, "B": {"subject": "b"}}
+
+        self.assertEqual(
+            _coerce_variants_raw(raw),
+            [{"subject": "a", "variant": "A"}, {"subject": "b", "variant": "B"}, {"subject": "c", "variant": "C"}],
+        )
+        self.assertEqual(
+            _coerce_variants_raw({"B": {"subject": "b"}, "D": {"subject": "d"}, "A": "bad"}),
+            [{"subject": "b", "variant": "B"}, {"subject": "d", "variant": "D"}],
+        )
+        self.assertEqual(_coerce_variants_raw([{"subject": "x"}, "bad"]), [{"subject": "x"}])
+        self.assertEqual(_coerce_variants_raw(None), [])
+
+
+class _FakeCompletions:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.calls = 0
+
+    def create(self, **_: object) -> SimpleNamespace:
+        self.calls += 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class LLMCacheTests(unittest.TestCase):
+    def test_identical_prompt_reuses_cached_variants(self) -> None:
+        llm = LLMGateway(api_key=None, chat_model="gpt-5", embedding_model="text-embedding-3-small")
+        completions = _FakeCompletions(
+            '{"variants": [{"variant": "A", "subject": "Ciao", "body": "Testo"}], "recommended_variant": "A"}'
+        )
+        llm._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        kwargs = dict(parent=PARENT, company=COMPANY, contact=CONTACT, dossier=DOSSIER, marketing_snippets=[])
+
+        first, _, _ = llm.generate_campaign_variants(**kwargs)
+        first[0].risk_flags.append("mutated")
+        second, recommended, _ = llm.generate_campaign_variants(**kwargs)
+
+        self.assertEqual(completions.calls, 1)
+        self.assertEqual(recommended, "A")
+        self.assertEqual([variant.variant for variant in second], ["A", "B", "C"])
+        self.assertEqual(second[0].subject, "Ciao")
+        self.assertEqual(second[0].risk_flags, [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import tempfile
+import io
 import textwrap
 import unittest
-from pathlib import Path
 
 from emailgenius.profiles import load_parent_profile
 
@@ -30,10 +29,7 @@ class ProfileTests(unittest.TestCase):
             """
         ).strip()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "profile.yaml"
-            path.write_text(payload, encoding="utf-8")
-            profile = load_parent_profile(path, slug_override="azienda-a")
+        profile = load_parent_profile(io.StringIO(payload), slug_override="azienda-a")
 
         self.assertEqual(profile.slug, "azienda-a")
         self.assertEqual(profile.company_name, "Azienda Madre A")
@@ -1,6 +1,6 @@
 import unittest
 
-from emailgenius.scoring import evaluate_transition50_eligibility
+from emailgenius.scoring import CreditRule, estimate_credit_rate, evaluate_transition50_eligibility
 from emailgenius.types import CompanySignals
 
 
@@ -29,6 +29,20 @@ class ScoringTests(unittest.TestCase):
         self.assertFalse(result.eligible)
         self.assertIsNone(result.estimated_credit_rate)
 
+    def test_best_rule_wins_across_metrics(self) -> None:
+        self.assertEqual(estimate_credit_rate(3.0, 15.0), 45)
+        self.assertEqual(estimate_credit_rate(6.0, 5.0), 40)
+        self.assertEqual(estimate_credit_rate(None, 5.0), 35)
+        self.assertIsNone(estimate_credit_rate(None, None))
+
+    def test_custom_rules_keep_declaration_priority(self) -> None:
+        rules = (
+            CreditRule(min_facility_pct=1.0, min_process_pct=50.0, credit_rate=10),
+            CreditRule(min_facility_pct=0.5, min_process_pct=2.0, credit_rate=99),
+        )
+        self.assertEqual(estimate_credit_rate(1.0, 40.0, rules), 10)
+        self.assertEqual(estimate_credit_rate(0.7, None, rules), 99)
+
 
 if __name__ == "__main__":
     unittest.main()
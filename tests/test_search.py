@@ -1,5 +1,6 @@
 import unittest
 
+from emailgenius import search as search_module
 from emailgenius.search import (
     build_news_query,
     build_site_query,
@@ -11,24 +12,34 @@ from emailgenius.search import (
 from emailgenius.types import SearchHit
 
 
+DUCKDUCKGO_HTML = """
+<html><body>
+  <a class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fwww.acme.it">Acme S.p.A.</a>
+  <a class="result__a" href="https://www.linkedin.com/company/acme">Acme LinkedIn</a>
+</body></html>
+"""
+
+
 class SearchTests(unittest.TestCase):
     def test_build_queries(self) -> None:
         self.assertEqual(build_site_query("Acme", "Vicenza"), "Acme Vicenza sito ufficiale")
         self.assertEqual(build_news_query("Acme", "Vicenza"), "Acme Vicenza news")
 
     def test_parse_duckduckgo_results(self) -> None:
-        html = """
-        <html><body>
-          <a class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fwww.acme.it">Acme S.p.A.</a>
-          <a class="result__a" href="https://www.linkedin.com/company/acme">Acme LinkedIn</a>
-        </body></html>
-        """
-        hits = parse_duckduckgo_html(html, max_results=5)
+        hits = parse_duckduckgo_html(DUCKDUCKGO_HTML, max_results=5)
 
         self.assertEqual(len(hits), 2)
         self.assertEqual(hits[0].url, "https://www.acme.it")
         self.assertEqual(hits[0].title, "Acme S.p.A.")
 
+    @unittest.skipUnless(search_module._FastHTMLParser is not None, "selectolax not installed")
+    def test_fast_duckduckgo_parser_matches_stdlib_parser(self) -> None:
+        parser = search_module._DuckDuckGoResultParser()
+        parser.feed(DUCKDUCKGO_HTML)
+
+        self.assertEqual(len(parser.hits), 2)
+        self.assertEqual(search_module._parse_duckduckgo_anchors_fast(DUCKDUCKGO_HTML), parser.hits)
+
     def test_parse_bing_results(self) -> None:
         html = """
         <html><body>
@@ -45,6 +56,14 @@ class SearchTests(unittest.TestCase):
         self.assertEqual(hits[0].url, "https://www.acme.it")
         self.assertEqual(hits[0].title, "Acme S.p.A. - Sito Ufficiale")
 
+    def test_parse_bing_results_skips_unclosed_headings(self) -> None:
+        html = (
+            '<h2><a href="https://broken.example.com">Broken</a> teaser '
+            '<h2><a href="https://www.acme.it">Acme <strong>S.p.A.</strong></a></h2>'
+        )
+        hits = parse_bing_html(html, max_results=5)
+        self.assertEqual([(hit.title, hit.url) for hit in hits], [("Acme S.p.A.", "https://www.acme.it")])
+
     def test_parse_bing_news_results(self) -> None:
         html = """
         <html><body>
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import csv
+import json
+import tempfile
+import time
+import unittest
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from emailgenius.types import SearchHit
+from emailgenius.utils import (
+    CSVWriter,
+    chunk_text,
+    compact_lines,
+    ensure_list,
+    fast_hash,
+    from_json,
+    json_dumps_bytes,
+    sha256_of_bytes,
+    sha256_of_file,
+    to_json,
+    utc_now_iso,
+    uuid7_batch,
+    write_csv,
+)
+
+
+class ChunkTextTests(unittest.TestCase):
+    def test_chunks_end_on_word_boundaries(self) -> None:
+        text = " ".join(f"parola{index}" for index in range(400))
+        chunks = chunk_text(text, chunk_size=200, overlap=40)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 200)
+            self.assertEqual(chunk, chunk.strip())
+        for chunk in chunks[:-1]:
+            self.assertTrue(chunk.split(" ")[-1].startswith("parola"))
+            self.assertIn(chunk.split(" ")[-1], text.split(" "))
+        self.assertTrue(text.endswith(chunks[-1]))
+
+    def test_collapses_whitespace_and_handles_empty_input(self) -> None:
+        self.assertEqual(chunk_text("  uno \n\n due\tTre  "), ["uno due Tre"])
+        self.assertEqual(chunk_text(""), [])
+        self.assertEqual(chunk_text(" \n\t "), [])
+
+    def test_short_text_is_single_chunk(self) -> None:
+        self.assertEqual(chunk_text("already clean", chunk_size=20), ["already clean"])
+        self.assertEqual(chunk_text(" needs\tcleaning ", chunk_size=20), ["needs cleaning"])
+
+    def test_rejects_non_positive_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            chunk_text("uno  due", chunk_size=0)
+
+
+class CompactLinesTests(unittest.TestCase):
+    def test_collapses_whitespace_and_respects_limit(self) -> None:
+        lines = ["clean line", "  padded\tline\n", "", "a\u00a0b", "x  y", "dropped"]
+
+        self.assertEqual(compact_lines(lines, limit=4), ["clean line", "padded line", "a b", "x y"])
+
+
+class EnsureListTests(unittest.TestCase):
+    def test_splits_strings_with_semicolon_precedence(self) -> None:
+        self.assertEqual(ensure_list("a, b ,c"), ["a", "b", "c"])
+        self.assertEqual(ensure_list("Rossi, Mario; Bianchi;"), ["Rossi, Mario", "Bianchi"])
+        self.assertEqual(ensure_list("  singolo  "), ["singolo"])
+        self.assertEqual(ensure_list("   "), [])
+        self.assertEqual(ensure_list([" x ", "", 3]), ["x", "3"])
+        self.assertEqual(ensure_list(None), [])
+
+
+class HashTests(unittest.TestCase):
+    def test_file_digest_matches_bytes_digest(self) -> None:
+        data = b"emailgenius" * 50_000
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "doc.bin"
+            path.write_bytes(data)
+            self.assertEqual(sha256_of_file(path), sha256_of_bytes(data))
+
+    def test_fast_hash_is_stable_per_process(self) -> None:
+        self.assertEqual(fast_hash(b"acme"), fast_hash(b"acme"))
+        self.assertNotEqual(fast_hash(b"acme"), fast_hash(b"beta"))
+        self.assertEqual(len(fast_hash(b"")), 64)
+
+
+class JsonTests(unittest.TestCase):
+    def test_round_trip_keeps_unicode_and_dataclasses(self) -> None:
+        payload = {"città": "Forlì", "hit": SearchHit(title="Acme", url="https://acme.it"), 1: [1.5, None]}
+        encoded = to_json(payload)
+
+        self.assertIn("Forlì", encoded)
+        self.assertEqual(
+            from_json(encoded),
+            {"città": "Forlì", "hit": {"title": "Acme", "url": "https://acme.it", "snippet": ""}, "1": [1.5, None]},
+        )
+        self.assertIsNone(from_json(""))
+
+    def test_indented_dataclass_matches_asdict_dump(self) -> None:
+        hit = SearchHit(title="Città", url="https://acme.it", snippet="")
+
+        self.assertEqual(to_json(hit, indent=True), json.dumps(asdict(hit), ensure_ascii=False, indent=2))
+
+    def test_bytes_helper_matches_to_json_with_non_str_keys(self) -> None:
+        payload = {1: "uno", "città": [None]}
+
+        self.assertEqual(json_dumps_bytes(payload), to_json(payload).encode("utf-8"))
+
+
+class TimestampTests(unittest.TestCase):
+    def test_utc_now_iso_has_second_precision(self) -> None:
+        parsed = datetime.fromisoformat(utc_now_iso())
+
+        self.assertEqual(parsed.utcoffset(), timedelta(0))
+        self.assertEqual(parsed.microsecond, 0)
+
+
+class Uuid7BatchTests(unittest.TestCase):
+    def test_batch_is_unique_version_7_with_rfc_variant(self) -> None:
+        ids = uuid7_batch(500)
+
+        self.assertEqual(len(set(ids)), 500)
+        for value in ids:
+            self.assertEqual(value.version, 7)
+            self.assertEqual(value.int >> 62 & 0b11, 0b10)
+
+    def test_timestamp_prefix_ascends_across_batches(self) -> None:
+        started_ms = time.time_ns() // 1_000_000
+        first = uuid7_batch(3)
+        second = uuid7_batch(3)
+        finished_ms = time.time_ns() // 1_000_000
+
+        prefixes = [value.int >> 80 for value in first + second]
+        self.assertEqual(prefixes, sorted(prefixes))
+        self.assertEqual(len(set(prefixes[:3])), 1)
+        self.assertTrue(started_ms <= prefixes[0] <= prefixes[-1] <= finished_ms)
+
+    def test_empty_batch(self) -> None:
+        self.assertEqual(uuid7_batch(0), [])
+
+
+class WriteCsvTests(unittest.TestCase):
+    def test_writes_header_and_flattens_values(self) -> None:
+        rows = [
+            {"name": "Acme", "tags": ["a", "b"], "meta": {"k": "v"}, "extra": "ignored"},
+            {"name": "Beta", "tags": None},
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / "out.csv"
+            write_csv(path, rows, ["name", "tags", "meta"])
+            with path.open("r", encoding="utf-8", newline="") as handle:
+                written = list(csv.reader(handle))
+
+        self.assertEqual(written[0], ["name", "tags", "meta"])
+        self.assertEqual(written[1][:2], ["Acme", "a; b"])
+        self.assertIn('"k"', written[1][2])
+        self.assertEqual(written[2], ["Beta", "", ""])
+
+    def test_writer_appends_batches_to_one_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "batch.csv"
+            with CSVWriter(path, ["name"]) as writer:
+                writer.add({"name": "Acme"})
+                writer.add({"name": "Beta"})
+            writer.close()
+            with path.open("r", encoding="utf-8", newline="") as handle:
+                written = list(csv.reader(handle))
+
+        self.assertEqual(written, [["name"], ["Acme"], ["Beta"]])
+
+    def test_add_rows_matches_row_by_row_output(self) -> None:
+        rows = [{"name": f"Lead {index}", "tags": ["a", str(index)]} for index in range(1200)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            batched = Path(tmpdir) / "batched.csv"
+            single = Path(tmpdir) / "single.csv"
+            with CSVWriter(batched, ["name", "tags"]) as writer:
+                writer.add_rows(iter(rows))
+            with CSVWriter(single, ["name", "tags"]) as writer:
+                for row in rows:
+                    writer.add(row)
+
+            self.assertEqual(batched.read_bytes(), single.read_bytes())
+
+    def test_failed_export_keeps_previous_file(self) -> None:
+        def failing_rows():
+            yield {"name": "Acme"}
+            raise RuntimeError("database went away")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "export.csv"
+            path.write_text("name\nPrevious\n", encoding="utf-8")
+            with self.assertRaises(RuntimeError):
+                write_csv(path, failing_rows(), ["name"])
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "name\nPrevious\n")
+            self.assertEqual([item.name for item in Path(tmpdir).iterdir()], ["export.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()